@@ -0,0 +1,7 @@
+"""
+Maze generation and traversal.
+
+The core modules (maze, generators, walkers) only depend on the standard
+library. The ipycanvas based renderers live in generation.renderers and are
+only imported when they are first used.
+"""
@@ -0,0 +1,326 @@
+"""
+A two tier cache for generated mazes and the artifacts derived from them.
+
+Tier 1 is an in process LRU that evicts by the total size in bytes of what it holds.
+Tier 2 is an optional content addressed store on disk. Values are stored once
+under the SHA-256 of their contents and cache keys point at those contents.
+
+Keys include the generator's version, so changing an algorithm invalidates
+everything it produced.
+
+Example
+cache = MazeCache(directory='.maze-cache')
+maze = cache.maze('random_backtracer', seed=42, width=40, height=40)
+path = cache.solution('random_backtracer', seed=42, width=40, height=40)
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Callable
+import hashlib
+import os
+from pathlib import Path
+import random
+import tempfile
+from threading import Lock
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+from .encoding import MAZE_FORMAT_VERSION, decode_maze, decode_path, encode_maze, encode_path
+from .generators import random_backtracer
+from .maze import Maze
+from .renderers import text_renderer
+from .structures import Point
+from .walkers import a_star
+
+# The generators the cache can build mazes with: name -> (generator, version)
+GENERATORS: Dict[str, Tuple[Callable[[Maze, random.Random], Maze], int]] = {
+  'random_backtracer': (random_backtracer.generate_maze_walls, random_backtracer.GENERATOR_VERSION)
+}
+
+# The names of the artifacts that can be derived from a maze. 'walls' is the encoded maze itself.
+WALLS_ARTIFACT = 'walls'
+SOLUTION_ARTIFACT = 'solution'
+TEXT_RENDER_ARTIFACT = 'render:text'
+
+DEFAULT_MAX_BYTES: int = 64 * 1024 * 1024
+
+class MazeKey(NamedTuple):
+  """Identifies a generated maze."""
+  generator: str
+  version: int
+  seed: int
+  width: int
+  height: int
+
+  def digest(self, artifact: str, artifact_version: str = '0') -> str:
+    """
+    The hex SHA-256 that identifies an artifact of this maze. Includes the
+    versions of the artifact and of the binary encoding, so changing either
+    invalidates the entries built before.
+    """
+    name = f'{self.generator}:{self.version}:{self.seed}:{self.width}:{self.height}:{artifact}:{artifact_version}:{MAZE_FORMAT_VERSION}'
+    return hashlib.sha256(name.encode('utf-8')).hexdigest()
+
+class LRUCache:
+  """A least recently used cache of bytes that is bounded by the total size of its values."""
+  def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+    self._items: OrderedDict[str, bytes] = OrderedDict()
+    self._max_bytes = max_bytes
+    self._size = 0
+    self._lock = Lock()
+
+  @property
+  def size(self) -> int:
+    """The number of bytes currently held."""
+    return self._size
+
+  @property
+  def max_bytes(self) -> int:
+    return self._max_bytes
+
+  def __len__(self) -> int:
+    return len(self._items)
+
+  def __contains__(self, key: str) -> bool:
+    return key in self._items
+
+  def get(self, key: str) -> Optional[bytes]:
+    """Finds a value and marks it as the most recently used. Returns None on a miss."""
+    with self._lock:
+      value = self._items.get(key)
+      if value is not None:
+        self._items.move_to_end(key)
+      return value
+
+  def put(self, key: str, value: bytes) -> None:
+    """
+    Adds a value, evicting the least recently used values until it fits.
+    Values larger than the cache are not stored.
+    """
+    if len(value) > self._max_bytes:
+      return
+    with self._lock:
+      if key in self._items:
+        self._size -= len(self._items.pop(key))
+      self._items[key] = value
+      self._size += len(value)
+      while self._size > self._max_bytes:
+        _evicted_key, evicted = self._items.popitem(last=False)
+        self._size -= len(evicted)
+
+  def clear(self) -> None:
+    with self._lock:
+      self._items.clear()
+      self._size = 0
+
+class ContentStore:
+  """
+  A content addressed store on disk.
+
+  Layout
+  objects/ab/cdef... The value, named by the SHA-256 of its contents.
+  keys/ab/cdef...    The SHA-256 of the value stored under a key.
+  """
+  def __init__(self, directory: Union[str, os.PathLike]) -> None:
+    self._directory = Path(directory)
+
+  @property
+  def directory(self) -> Path:
+    return self._directory
+
+  def _path(self, kind: str, digest: str) -> Path:
+    return self._directory / kind / digest[:2] / digest[2:]
+
+  def _write(self, path: Path, data: bytes) -> None:
+    """Writes a file atomically so concurrent readers never see a partial value."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temp_name = tempfile.mkstemp(dir=path.parent)
+    try:
+      with os.fdopen(descriptor, 'wb') as temp_file:
+        temp_file.write(data)
+      os.replace(temp_name, path)
+    except BaseException:
+      os.unlink(temp_name)
+      raise
+
+  def _is_intact(self, object_path: Path, content_digest: str) -> bool:
+    """Checks that a stored object still hashes to its name."""
+    try:
+      return hashlib.sha256(object_path.read_bytes()).hexdigest() == content_digest
+    except FileNotFoundError:
+      return False
+
+  def _discard(self, path: Path) -> None:
+    try:
+      path.unlink()
+    except FileNotFoundError:
+      pass
+
+  def get(self, key: str) -> Optional[bytes]:
+    """
+    Finds the value stored under a key. Returns None if it isn't stored.
+    A corrupt or missing object is removed along with the key, so the next
+    put stores it again.
+    """
+    key_path = self._path('keys', key)
+    try:
+      content_digest = key_path.read_text().strip()
+    except (FileNotFoundError, ValueError):
+      return None
+
+    if len(content_digest) != 64 or any(c not in '0123456789abcdef' for c in content_digest):
+      self._discard(key_path)
+      return None
+
+    object_path = self._path('objects', content_digest)
+    try:
+      value = object_path.read_bytes()
+    except FileNotFoundError:
+      self._discard(key_path)
+      return None
+
+    if hashlib.sha256(value).hexdigest() != content_digest:
+      self._discard(object_path)
+      self._discard(key_path)
+      return None
+    return value
+
+  def put(self, key: str, value: bytes) -> str:
+    """
+    Stores a value under a key. Identical values are only written once.
+
+    Returns
+    The SHA-256 of the value.
+    """
+    content_digest = hashlib.sha256(value).hexdigest()
+    object_path = self._path('objects', content_digest)
+    if not self._is_intact(object_path, content_digest):
+      self._write(object_path, value)
+    self._write(self._path('keys', key), content_digest.encode('ascii'))
+    return content_digest
+
+class MazeCache:
+  """Serves generated mazes and their derived artifacts from memory, then disk, then by computing them."""
+  def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, directory: Optional[Union[str, os.PathLike]] = None) -> None:
+    self._memory = LRUCache(max_bytes)
+    self._disk: Optional[ContentStore] = ContentStore(directory) if directory is not None else None
+    self.hits = 0
+    self.disk_hits = 0
+    self.misses = 0
+
+  @property
+  def memory(self) -> LRUCache:
+    return self._memory
+
+  @property
+  def disk(self) -> Optional[ContentStore]:
+    return self._disk
+
+  def key(self, generator: str, seed: int, width: int, height: int) -> MazeKey:
+    """
+    Builds the key for a maze.
+
+    Throws
+    Raises a KeyError if the generator is unknown.
+    """
+    if generator not in GENERATORS:
+      raise KeyError(f'Unknown maze generator {generator}. Expected one of {list(GENERATORS.keys())}.')
+    _generate, version = GENERATORS[generator]
+    return MazeKey(generator, version, seed, width, height)
+
+  def lookup(self, key: MazeKey, name: str) -> Optional[bytes]:
+    """Finds an artifact in memory, then on disk. Returns None on a miss."""
+    digest = _artifact_digest(key, name)
+    value = self._memory.get(digest)
+    if value is not None:
+      self.hits += 1
+      return value
+
+    if self._disk is not None:
+      value = self._disk.get(digest)
+      if value is not None:
+        self.disk_hits += 1
+        self._memory.put(digest, value)
+        return value
+
+    self.misses += 1
+    return None
+
+  def store(self, key: MazeKey, name: str, value: bytes) -> None:
+    """Saves an artifact in both tiers."""
+    digest = _artifact_digest(key, name)
+    self._memory.put(digest, value)
+    if self._disk is not None:
+      self._disk.put(digest, value)
+
+  def artifact(self, key: MazeKey, name: str, compute: Optional[Callable[[], bytes]] = None) -> bytes:
+    """
+    Finds an artifact of a maze. On a miss the artifact is computed and stored
+    in both tiers.
+
+    Args:
+      key: The maze the artifact was derived from.
+      name: Identifies the artifact, for example 'solution' or 'render:text'.
+      compute: Builds the artifact's bytes on a miss. Defaults to the builder
+      registered in ARTIFACT_BUILDERS for the name. Artifacts that aren't
+      registered have no version, so put one in their name.
+    """
+    value = self.lookup(key, name)
+    if value is None:
+      value = compute() if compute is not None else ARTIFACT_BUILDERS[name][0](self, key)
+      self.store(key, name, value)
+    return value
+
+  def maze_bytes(self, generator: str, seed: int, width: int, height: int) -> bytes:
+    """Finds the encoded walls of a maze, generating it on a miss."""
+    return self.artifact(self.key(generator, seed, width, height), WALLS_ARTIFACT)
+
+  def maze(self, generator: str, seed: int, width: int, height: int) -> Maze:
+    """
+    Finds a maze, generating it on a miss.
+    A new Maze instance is returned each time, so it is safe to modify.
+    """
+    return decode_maze(self.maze_bytes(generator, seed, width, height))
+
+  def solution(self, generator: str, seed: int, width: int, height: int) -> List[Point]:
+    """Finds the path from a maze's entrance to its exit, solving it on a miss."""
+    return decode_path(self.artifact(self.key(generator, seed, width, height), SOLUTION_ARTIFACT))
+
+def generate_encoded_maze(key: MazeKey) -> bytes:
+  """Generates the maze identified by a key and encodes it."""
+  generate, _version = GENERATORS[key.generator]
+  maze = Maze(key.width, key.height)
+  generate(maze, random.Random(key.seed))
+  return encode_maze(maze)
+
+def _build_walls(cache: MazeCache, key: MazeKey) -> bytes:
+  return generate_encoded_maze(key)
+
+def _build_solution(cache: MazeCache, key: MazeKey) -> bytes:
+  return encode_path(a_star.solve_maze(decode_maze(cache.artifact(key, WALLS_ARTIFACT))))
+
+def _build_text_render(cache: MazeCache, key: MazeKey) -> bytes:
+  maze = decode_maze(cache.artifact(key, WALLS_ARTIFACT))
+  path = decode_path(cache.artifact(key, SOLUTION_ARTIFACT))
+  return text_renderer.render_text(maze, path).encode('utf-8')
+
+# How to build each named artifact on a cache miss: name -> (builder(cache, key), version)
+# The version covers everything the artifact is derived from, except the
+# generator, which is part of the MazeKey.
+ARTIFACT_BUILDERS: Dict[str, Tuple[Callable[[MazeCache, MazeKey], bytes], str]] = {
+  WALLS_ARTIFACT: (_build_walls, '0'),
+  SOLUTION_ARTIFACT: (_build_solution, f'solver{a_star.SOLVER_VERSION}'),
+  TEXT_RENDER_ARTIFACT: (_build_text_render, f'solver{a_star.SOLVER_VERSION}-text{text_renderer.TEXT_RENDER_VERSION}')
+}
+
+# The artifacts each builder reads from the cache. Anything that computes an
+# artifact somewhere else, like the service's workers, supplies these first.
+ARTIFACT_DEPENDENCIES: Dict[str, List[str]] = {
+  WALLS_ARTIFACT: [],
+  SOLUTION_ARTIFACT: [WALLS_ARTIFACT],
+  TEXT_RENDER_ARTIFACT: [WALLS_ARTIFACT, SOLUTION_ARTIFACT]
+}
+
+def _artifact_digest(key: MazeKey, name: str) -> str:
+  _builder, version = ARTIFACT_BUILDERS.get(name, (None, '0'))
+  return key.digest(name, version)
@@ -0,0 +1,110 @@
+"""
+Command line entry point for batch maze jobs.
+
+Usage
+mazes generate --width 20 --height 20 --seed 42
+mazes solve --width 20 --height 20 --seed 42
+mazes render --width 20 --height 20 --seed 42 --path
+mazes serve --socket /tmp/mazes.sock
+"""
+import argparse
+import random
+from typing import List, Optional
+
+from .maze import Maze
+from .structures import Point
+
+def build_maze(width: int, height: int, seed: Optional[int]) -> Maze:
+  """Creates a maze and opens its walls. A seed makes the maze reproducible."""
+  from .generators.random_backtracer import generate_maze_walls
+  maze = Maze(width, height)
+  generate_maze_walls(maze, random.Random(seed) if seed is not None else None)
+  return maze
+
+def _load_maze(args: argparse.Namespace) -> Maze:
+  """Builds the requested maze. Seeded mazes are served from the cache when a cache directory is given."""
+  if args.cache_dir is not None and args.seed is not None:
+    from .cache import MazeCache
+    return MazeCache(directory=args.cache_dir).maze('random_backtracer', args.seed, args.width, args.height)
+  return build_maze(args.width, args.height, args.seed)
+
+def _load_solution(args: argparse.Namespace, maze: Maze) -> List[Point]:
+  if args.cache_dir is not None and args.seed is not None:
+    from .cache import MazeCache
+    return MazeCache(directory=args.cache_dir).solution('random_backtracer', args.seed, args.width, args.height)
+  from .walkers.a_star import solve_maze
+  return solve_maze(maze)
+
+def _generate(args: argparse.Namespace) -> int:
+  from .renderers.text_renderer import render_text
+  print(render_text(_load_maze(args)))
+  return 0
+
+def _solve(args: argparse.Namespace) -> int:
+  for point in _load_solution(args, _load_maze(args)):
+    print(f'{point.x} {point.y}')
+  return 0
+
+def _render(args: argparse.Namespace) -> int:
+  from .renderers.text_renderer import render_text
+  maze = _load_maze(args)
+  path = _load_solution(args, maze) if args.path else None
+  print(render_text(maze, path))
+  return 0
+
+def _serve(args: argparse.Namespace) -> int:
+  import asyncio
+  from concurrent.futures import ProcessPoolExecutor
+  from functools import partial
+  from .cache import MazeCache
+  from .service import MazeService
+  service = MazeService(MazeCache(directory=args.cache_dir), executor_factory=partial(ProcessPoolExecutor, args.workers))
+  try:
+    asyncio.run(service.serve(socket_path=args.socket, host=args.host, port=args.port))
+  except KeyboardInterrupt:
+    pass
+  finally:
+    service.close()
+  return 0
+
+def _dimension(value: str) -> int:
+  dimension = int(value)
+  if dimension < 1:
+    raise argparse.ArgumentTypeError('The width and height must be at least 1.')
+  return dimension
+
+def _add_maze_arguments(parser: argparse.ArgumentParser) -> None:
+  parser.add_argument('--width', type=_dimension, default=20, help='The number of cells in a row.')
+  parser.add_argument('--height', type=_dimension, default=20, help='The number of rows.')
+  parser.add_argument('--seed', type=int, default=None, help='Seed for the random number generator.')
+  parser.add_argument('--cache-dir', default=None, help='Directory of the on disk maze cache. Only used with --seed.')
+
+def build_parser() -> argparse.ArgumentParser:
+  parser = argparse.ArgumentParser(prog='mazes', description='Generate, solve and render mazes.')
+  commands = parser.add_subparsers(dest='command', required=True)
+
+  generate = commands.add_parser('generate', help='Generate a maze and print it as text.')
+  _add_maze_arguments(generate)
+  generate.set_defaults(handler=_generate)
+
+  solve = commands.add_parser('solve', help='Print the path from the entrance to the exit, one "x y" per line.')
+  _add_maze_arguments(solve)
+  solve.set_defaults(handler=_solve)
+
+  render = commands.add_parser('render', help='Render a maze as text.')
+  _add_maze_arguments(render)
+  render.add_argument('--path', action='store_true', help='Draw the solution on the maze.')
+  render.set_defaults(handler=_render)
+
+  serve = commands.add_parser('serve', help='Run the local maze service.')
+  serve.add_argument('--socket', default=None, help='Listen on this Unix socket instead of TCP.')
+  serve.add_argument('--host', default='127.0.0.1', help='The TCP address to listen on.')
+  serve.add_argument('--port', type=int, default=8765, help='The TCP port to listen on.')
+  serve.add_argument('--workers', type=int, default=None, help='The number of worker processes. Defaults to the number of CPUs.')
+  serve.add_argument('--cache-dir', default=None, help='Directory of the on disk maze cache.')
+  serve.set_defaults(handler=_serve)
+  return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+  args = build_parser().parse_args(argv)
+  return args.handler(args)
@@ -0,0 +1,99 @@
+"""
+Compact binary encodings for mazes and paths.
+
+A maze is encoded as a fixed header followed by one byte per cell, row by row.
+Each cell's byte is a bit mask of its closed walls.
+"""
+import struct
+from typing import List, Optional
+
+from .direction import Direction
+from .maze import Maze, MazeCell
+from .structures import Point
+
+# Bit flags for a closed wall.
+WALL_BITS: dict[Direction, int] = {
+  Direction.NORTH: 1,
+  Direction.EAST: 2,
+  Direction.SOUTH: 4,
+  Direction.WEST: 8
+}
+
+MAZE_MAGIC = b'MAZE'
+MAZE_FORMAT_VERSION = 1
+
+# magic, format version, width, height, start x, start y, exit x, exit y
+# A location of -1 means the maze doesn't have that cell.
+_MAZE_HEADER = struct.Struct('<4sBIIiiii')
+_PATH_HEADER = struct.Struct('<I')
+
+def cell_wall_mask(cell: MazeCell) -> int:
+  """Find the bit mask of the closed walls of a cell."""
+  mask = 0
+  if cell.north: mask |= WALL_BITS[Direction.NORTH]
+  if cell.east: mask |= WALL_BITS[Direction.EAST]
+  if cell.south: mask |= WALL_BITS[Direction.SOUTH]
+  if cell.west: mask |= WALL_BITS[Direction.WEST]
+  return mask
+
+def encode_walls(maze: Maze) -> bytes:
+  """
+  Builds the wall bitmap of a maze.
+
+  Returns
+  width * height bytes, row by row, of cell wall masks.
+  """
+  return bytes(cell_wall_mask(maze.cell(Point(x, y))) for y in range(maze.height) for x in range(maze.width))
+
+def _location_or_missing(cell: Optional[MazeCell]) -> Point:
+  return cell.location if cell is not None else Point(-1, -1)
+
+def encode_maze(maze: Maze) -> bytes:
+  """Encodes a maze's dimensions, entrance, exit and walls."""
+  start = _location_or_missing(getattr(maze, 'starting_cell', None))
+  exit = _location_or_missing(getattr(maze, 'exit_cell', None))
+  header = _MAZE_HEADER.pack(MAZE_MAGIC, MAZE_FORMAT_VERSION, maze.width, maze.height, start.x, start.y, exit.x, exit.y)
+  return header + encode_walls(maze)
+
+def decode_maze(data: bytes) -> Maze:
+  """
+  Rebuilds a maze from the output of encode_maze.
+
+  Throws
+  Raises a ValueError if the data is not an encoded maze.
+  """
+  if len(data) < _MAZE_HEADER.size:
+    raise ValueError('The data is too short to be an encoded maze.')
+  magic, version, width, height, start_x, start_y, exit_x, exit_y = _MAZE_HEADER.unpack_from(data)
+  if magic != MAZE_MAGIC or version != MAZE_FORMAT_VERSION:
+    raise ValueError('The data is not an encoded maze or is an unsupported version.')
+  walls = data[_MAZE_HEADER.size:]
+  if len(walls) != width * height:
+    raise ValueError(f'Expected {width * height} cells but found {len(walls)}.')
+
+  maze = Maze(width, height)
+  for y in range(height):
+    for x in range(width):
+      cell = maze.cell(Point(x, y))
+      mask = walls[y * width + x]
+      for direction, bit in WALL_BITS.items():
+        if not mask & bit:
+          cell.remove_wall(direction)
+      cell.visit()
+
+  if start_x >= 0:
+    maze.starting_cell = maze.cell(Point(start_x, start_y))
+  if exit_x >= 0:
+    maze.exit_cell = maze.cell(Point(exit_x, exit_y))
+  return maze
+
+def encode_path(path: List[Point]) -> bytes:
+  """Encodes a path as a point count followed by x,y pairs."""
+  coordinates = [int(c) for point in path for c in point]
+  return _PATH_HEADER.pack(len(path)) + struct.pack(f'<{len(coordinates)}I', *coordinates)
+
+def decode_path(data: bytes) -> List[Point]:
+  """Rebuilds a path from the output of encode_path."""
+  (count,) = _PATH_HEADER.unpack_from(data)
+  coordinates = struct.unpack_from(f'<{count * 2}I', data, _PATH_HEADER.size)
+  return [Point(coordinates[i], coordinates[i + 1]) for i in range(0, len(coordinates), 2)]
@@ -1,10 +1,14 @@
 import random
-from typing import List, Dict
+from typing import List, Dict, Optional
 
-from generation.stack import Stack
-from generation.structures import Point
-from generation.direction import Direction, DIR_OPPOSITES
-from generation.maze import Maze, MazeCell
+from ..stack import Stack
+from ..structures import Point
+from ..direction import Direction, DIR_OPPOSITES
+from ..maze import Maze, MazeCell
+
+# Bump when a change to the algorithm would produce different walls for the same seed.
+# Cached mazes are keyed by this so they are invalidated.
+GENERATOR_VERSION: int = 1
 
 """
 1. Choose the initial cell, mark it as visited and push it to the stack.
@@ -17,27 +21,31 @@ from generation.maze import Maze, MazeCell
     4. Push the current cell back on the stack (back tracking)
     5. Mark the chosen cell as visited and push it to the stack. (Continue exploring with)
 """
-def generate_maze_walls(maze: Maze) -> Maze:
+def generate_maze_walls(maze: Maze, rng: Optional[random.Random] = None) -> Maze:
   """
   Traverses the grid of cells creates a maze by opening walls in place.
 
+  Args:
+    rng: The random number generator to use. Defaults to the random module.
+    Pass random.Random(seed) to generate a reproducible maze.
+
   Returns:
     The modified grid.
   """
+  rng = rng if rng is not None else random
   stack = Stack()
   
   # Establish Starting Cell
-  starting_cell_loc: Point = Point(random.randint(0, maze.width - 1), 0) # Randomly select a cell in the north most row.
+  starting_cell_loc: Point = Point(rng.randint(0, maze.width - 1), 0) # Randomly select a cell in the north most row.
   starting_cell = maze.cell(starting_cell_loc)
   starting_cell.remove_wall(Direction.NORTH) # Create an opening in the maze
   maze.starting_cell = starting_cell #Saving a pointer for visualization and and solving.
 
   # Establish Target Cell. This is the exit of the maze.
-  exit_cell_loc: Point = Point(random.randint(0, maze.width - 1), maze.height-1) # Randomly select a cell in the South most row.
+  exit_cell_loc: Point = Point(rng.randint(0, maze.width - 1), maze.height-1) # Randomly select a cell in the South most row.
   exit_cell = maze.cell(exit_cell_loc)
   exit_cell.remove_wall(Direction.SOUTH) # Create an opening in the maze for the exit.
   maze.exit_cell = exit_cell #Saving a pointer for visualization and and solving.
-  print(f"Exit cell: {exit_cell_loc}")
 
   starting_cell.visit() 
   stack.push(starting_cell)
@@ -53,7 +61,7 @@ def generate_maze_walls(maze: Maze) -> Maze:
       # unvisited_neighbor = list(unvisited_neighbors.items())[0] # Type: List[(direction, MazeCell)]
       
       # Attempt 2. Randomize which unvisited neighbor is traversed next.
-      pick_cell = random.randint(0, len(unvisited_neighbors) - 1)
+      pick_cell = rng.randint(0, len(unvisited_neighbors) - 1)
       unvisited_neighbor: List[(Direction, MazeCell)] = list(unvisited_neighbors.items())[pick_cell]
 
       # Remove the wall between the current cell and the chosen cell.
@@ -1,8 +1,8 @@
 from enum import Enum
 from typing import List, Dict, Optional
 
-from generation.direction import Direction
-from generation.structures import Point
+from .direction import Direction
+from .structures import Point
 
 class MazeCell:
   """
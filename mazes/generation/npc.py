@@ -1,7 +1,14 @@
+from __future__ import annotations
+
 from collections.abc import Callable
-from generation.direction import Direction
-from generation.structures import Point
-from generation.maze import Maze
+from typing import Optional, TYPE_CHECKING
+
+from .direction import Direction
+from .structures import Point
+from .maze import Maze
+
+if TYPE_CHECKING:
+  from .spatial import OccupancyGrid
 
 class Agent:
   """A generic, autonomous agent."""
@@ -9,12 +16,14 @@ class Agent:
   _last_location: Point # The last place the agent remembers it was.
   _facing: Direction # The direction the agent is facing.
   _crest: str # The color to represent the agent.
+  _occupancy: Optional[OccupancyGrid] # The spatial index tracking the agent, if any.
 
   def __init__(self, crest='blue') -> None:
     """Create a new instance of an agent."""
     self._crest = crest
     self._location = Point(0,0)
     self._last_location = Point(0,0)
+    self._occupancy = None
 
   def face(self, direction: Direction) -> None:
     """Set the direction the agent is facing."""
@@ -32,6 +41,8 @@ class Agent:
     """Tell the agent to walk to the new location in the maze."""
     self._last_location = self.location
     self._location = new_location
+    if self._occupancy is not None:
+      self._occupancy.move(self, self._last_location, new_location)
 
   @property
   def location(self) -> Point:
@@ -41,6 +52,15 @@ class Agent:
   def last_location(self) -> Point:
     return self._last_location
 
+  @property
+  def occupancy(self) -> Optional[OccupancyGrid]:
+    """The spatial index tracking the agent. Set by OccupancyGrid.add."""
+    return self._occupancy
+
+  @occupancy.setter
+  def occupancy(self, grid: Optional[OccupancyGrid]) -> None:
+    self._occupancy = grid
+
   def maze_strategy(self, strategy: Callable[..., None]) -> None:
     """Assign a maze traversal algorithm to the agent."""
     self._maze_strategy = strategy
@@ -0,0 +1,34 @@
+"""
+Renderers for drawing mazes and agents.
+
+The canvas renderers depend on ipycanvas. To keep the core package importable
+without it, the renderers are resolved lazily on first attribute access.
+
+Example
+from generation.renderers import draw_maze # Imports ipycanvas here.
+"""
+from importlib import import_module
+from typing import Any
+
+# Maps a public name to the module (relative to this package) that defines it.
+_LAZY_ATTRIBUTES: dict[str, str] = {
+  'draw_maze': '.wall_drawer',
+  'draw_cell_walls': '.wall_drawer',
+  'animate_drawing_by_rooms': '.wall_drawer',
+  'draw_agents': '.agents_renderer',
+  'Viewport': '.viewport_renderer',
+  'ViewportRenderer': '.viewport_renderer',
+  'render_text': '.text_renderer'
+}
+
+__all__ = list(_LAZY_ATTRIBUTES.keys())
+
+def __getattr__(name: str) -> Any:
+  if name not in _LAZY_ATTRIBUTES:
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+  value = getattr(import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+  globals()[name] = value # Cache it so __getattr__ isn't called again.
+  return value
+
+def __dir__() -> list[str]:
+  return sorted(list(globals().keys()) + __all__)
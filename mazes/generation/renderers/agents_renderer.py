@@ -1,10 +1,9 @@
 from typing import List
 from ipycanvas import Canvas, hold_canvas
-from traitlets.traitlets import Int
 
-from generation.npc import Agent
-from generation.structures import Corner, Point
-from generation.renderers.units import AGENT_SIZE, ROOM_SIZE_WIDTH, ROOM_SIZE_HEIGHT
+from ..npc import Agent
+from ..structures import Corner, Point
+from .units import AGENT_SIZE, ROOM_SIZE_WIDTH, ROOM_SIZE_HEIGHT
 
 def build_agent_rect(location: Point, horizontal_offset: int, vertical_offset: int, agent_offset: int) -> Corner:
   upper_left_corner = Corner(location.x * ROOM_SIZE_WIDTH, location.y * ROOM_SIZE_HEIGHT)
@@ -0,0 +1,57 @@
+"""
+Downsampled overview images of a maze's walls.
+
+The wall bitmap has a pixel for every cell, wall and wall corner, so a
+maze of W x H cells is a (2H + 1) x (2W + 1) image. Each level of the
+pyramid halves the previous one by averaging 2x2 blocks, so a dense area
+of walls fades to grey rather than disappearing.
+"""
+from typing import List
+
+import numpy as np
+
+from ..direction import Direction
+from ..encoding import WALL_BITS, encode_walls
+from ..maze import Maze
+
+WALL: int = 255
+OPEN: int = 0
+
+def wall_bitmap(maze: Maze) -> np.ndarray:
+  """
+  Builds the full resolution wall bitmap.
+
+  Returns
+  A (2 * height + 1, 2 * width + 1) uint8 array. Walls are 255, open space 0.
+  """
+  width, height = maze.width, maze.height
+  walls = np.frombuffer(encode_walls(maze), dtype=np.uint8).reshape(height, width)
+  def closed(mask: np.ndarray, direction: Direction) -> np.ndarray:
+    return np.where(mask & WALL_BITS[direction], WALL, OPEN)
+
+  bitmap = np.full((2 * height + 1, 2 * width + 1), OPEN, dtype=np.uint8)
+  bitmap[::2, ::2] = WALL # The corners of the cells are always drawn.
+  bitmap[0:2 * height:2, 1::2] = closed(walls, Direction.NORTH)
+  bitmap[2 * height, 1::2] = closed(walls[height - 1], Direction.SOUTH)
+  bitmap[1::2, 0:2 * width:2] = closed(walls, Direction.WEST)
+  bitmap[1::2, 2 * width] = closed(walls[:, width - 1], Direction.EAST)
+  return bitmap
+
+def downsample(image: np.ndarray) -> np.ndarray:
+  """Halves an image by averaging 2x2 blocks. Odd edges are padded with open space."""
+  rows, columns = image.shape
+  padded = np.pad(image, ((0, rows % 2), (0, columns % 2)), constant_values=OPEN)
+  blocks = padded.reshape(padded.shape[0] // 2, 2, padded.shape[1] // 2, 2).astype(np.uint16)
+  return (blocks.sum(axis=(1, 3)) // 4).astype(np.uint8)
+
+def build_pyramid(maze: Maze) -> List[np.ndarray]:
+  """
+  Builds the mipmap pyramid of a maze's walls.
+
+  Returns
+  The levels, starting with the full resolution bitmap and ending with a 1x1 image.
+  """
+  levels = [wall_bitmap(maze)]
+  while max(levels[-1].shape) > 1:
+    levels.append(downsample(levels[-1]))
+  return levels
@@ -0,0 +1,41 @@
+from typing import List, Optional, Set
+
+from ..maze import Maze
+from ..structures import Point
+
+# Bump when the text layout changes. Cached renders are keyed by this so they are invalidated.
+TEXT_RENDER_VERSION: int = 1
+
+def render_text(maze: Maze, path: Optional[List[Point]] = None) -> str:
+  """
+  Renders the maze as plain text. This has no dependencies so it can be used
+  from the command line or in headless jobs.
+
+  Example of a 2x1 maze with a path through it.
+  +   +---+
+  | *   * |
+  +---+   +
+
+  Returns
+  The maze as a multiline string.
+  """
+  on_path: Set[Point] = set(path) if path is not None else set()
+  lines: List[str] = []
+  for row_index in range(maze.height):
+    top = '+'
+    middle = ''
+    for cell_index in range(maze.width):
+      cell = maze.cell(Point(cell_index, row_index))
+      top += ('---' if cell.north else '   ') + '+'
+      middle += ('|' if cell.west else ' ') + (' * ' if cell.location in on_path else '   ')
+    last_cell = maze.cell(Point(maze.width - 1, row_index))
+    middle += '|' if last_cell.east else ' '
+    lines.append(top)
+    lines.append(middle)
+
+  bottom = '+'
+  for cell_index in range(maze.width):
+    cell = maze.cell(Point(cell_index, maze.height - 1))
+    bottom += ('---' if cell.south else '   ') + '+'
+  lines.append(bottom)
+  return '\n'.join(lines)
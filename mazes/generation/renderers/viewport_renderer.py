@@ -0,0 +1,182 @@
+"""
+Renders a window onto a very large maze at a constant cost per frame.
+
+Only the cells inside the viewport are drawn. When zoomed in, the visible
+cells' walls are stroked as lines. When zoomed out far enough that the walls
+would be a few pixels apart, the renderer switches to the mipmap pyramid of
+the wall bitmap (see mipmap.py) and draws pre-rendered tiles of the
+level that best matches the zoom. Tiles are cached so panning reuses them.
+
+Example
+renderer = ViewportRenderer(maze, canvas)
+renderer.draw(Viewport(x=0, y=0, cell_size=20))  # The top left corner, zoomed in.
+renderer.draw(Viewport(x=0, y=0, cell_size=0.5)) # The whole of a 1600x1600 maze.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+import math
+from typing import NamedTuple, Tuple
+
+from ipycanvas import Canvas, hold_canvas
+import numpy as np
+
+from ..maze import Maze
+from .mipmap import WALL, build_pyramid
+
+# Below this many pixels per cell, draw from the mipmap tiles instead of stroking walls.
+DETAIL_MIN_CELL_SIZE: float = 8
+
+# The width and height, in pixels of a pyramid level, of a tile.
+TILE_SIZE: int = 256
+
+class Viewport(NamedTuple):
+  """The part of the maze to draw."""
+  x: float # The maze x coordinate, in cells, at the left edge of the canvas.
+  y: float # The maze y coordinate, in cells, at the top edge of the canvas.
+  cell_size: float # The zoom, in canvas pixels per cell.
+
+class CellRange(NamedTuple):
+  """An inclusive range of cells."""
+  first_x: int
+  first_y: int
+  last_x: int
+  last_y: int
+
+  def empty(self) -> bool:
+    return self.first_x > self.last_x or self.first_y > self.last_y
+
+def visible_cells(viewport: Viewport, canvas_width: int, canvas_height: int, maze_width: int, maze_height: int) -> CellRange:
+  """Finds the cells that are at least partially inside the viewport, clamped to the maze."""
+  first_x = max(0, math.floor(viewport.x))
+  first_y = max(0, math.floor(viewport.y))
+  last_x = min(maze_width - 1, math.ceil(viewport.x + canvas_width / viewport.cell_size) - 1)
+  last_y = min(maze_height - 1, math.ceil(viewport.y + canvas_height / viewport.cell_size) - 1)
+  return CellRange(first_x, first_y, last_x, last_y)
+
+def pyramid_level_for(cell_size: float, level_count: int) -> int:
+  """
+  Picks the finest pyramid level whose pixels are at least one canvas pixel
+  wide, so no detail is drawn smaller than the canvas can show. A cell is
+  2 pixels of the full resolution bitmap.
+  """
+  pixel_size = cell_size / 2
+  if pixel_size >= 1:
+    return 0
+  return min(level_count - 1, math.ceil(math.log2(1 / pixel_size)))
+
+class ViewportRenderer:
+  """Draws the visible part of a maze, switching to overview tiles when zoomed out."""
+  def __init__(self, maze: Maze, canvas: Canvas, max_tiles: int = 256, color: str = 'black') -> None:
+    """
+    Args:
+      maze: The maze to draw. The renderer doesn't track later changes to its walls.
+      canvas: Where to draw.
+      max_tiles: How many rendered tiles to keep for reuse while panning.
+      color: The color of the walls when zoomed in.
+    """
+    self._maze = maze
+    self._canvas = canvas
+    self._color = color
+    self._max_tiles = max_tiles
+    self._tiles: OrderedDict[Tuple[int, int, int], Canvas] = OrderedDict()
+    self._evicted: list[Canvas] = [] # Tiles to close once the frame has been sent.
+    self._pyramid = build_pyramid(maze)
+
+  @property
+  def pyramid(self) -> list[np.ndarray]:
+    return self._pyramid
+
+  def draw(self, viewport: Viewport) -> Canvas:
+    """
+    Clears the canvas and draws the part of the maze inside the viewport.
+
+    Throws
+    Raises a ValueError if the viewport's cell size isn't positive.
+    """
+    if not viewport.cell_size > 0:
+      raise ValueError('The viewport\'s cell size must be greater than 0.')
+    with hold_canvas(self._canvas):
+      self._canvas.clear()
+      if viewport.cell_size >= DETAIL_MIN_CELL_SIZE:
+        self._draw_walls(viewport)
+      else:
+        self._draw_tiles(viewport)
+
+    # The held frame may draw tiles that were evicted while building it,
+    # so they can only be closed after it has been sent to the frontend.
+    for tile in self._evicted:
+      tile.close() # Release the widget's model in the frontend.
+    self._evicted.clear()
+    return self._canvas
+
+  def _draw_walls(self, viewport: Viewport) -> None:
+    """Strokes the walls of the visible cells as a single path."""
+    cells = visible_cells(viewport, self._canvas.width, self._canvas.height, self._maze.width, self._maze.height)
+    if cells.empty():
+      return
+
+    # The full resolution bitmap has a wall pixel between every pair of adjacent cells.
+    bitmap = self._pyramid[0]
+    size = viewport.cell_size
+    def screen(x: int, y: int) -> Tuple[float, float]:
+      return ((x - viewport.x) * size, (y - viewport.y) * size)
+
+    canvas = self._canvas
+    canvas.line_width = max(1, size / 4)
+    canvas.stroke_style = self._color
+    canvas.begin_path()
+    # Each cell draws its north and west walls. The last row and column also draw their south and east walls.
+    for y in range(cells.first_y, cells.last_y + 2):
+      for x in range(cells.first_x, cells.last_x + 2):
+        if x <= cells.last_x and bitmap[2 * y, 2 * x + 1] == WALL:
+          canvas.move_to(*screen(x, y))
+          canvas.line_to(*screen(x + 1, y))
+        if y <= cells.last_y and bitmap[2 * y + 1, 2 * x] == WALL:
+          canvas.move_to(*screen(x, y))
+          canvas.line_to(*screen(x, y + 1))
+    canvas.stroke()
+
+  def _draw_tiles(self, viewport: Viewport) -> None:
+    """Draws the cached overview tiles that overlap the viewport."""
+    level = pyramid_level_for(viewport.cell_size, len(self._pyramid))
+    image = self._pyramid[level]
+
+    # The size in canvas pixels of a pixel of this level.
+    pixel_size = viewport.cell_size / 2 * (2 ** level)
+    # The viewport's top left corner in pixels of this level.
+    origin_x = viewport.x * 2 / (2 ** level)
+    origin_y = viewport.y * 2 / (2 ** level)
+
+    first_tile_x = max(0, math.floor(origin_x / TILE_SIZE))
+    first_tile_y = max(0, math.floor(origin_y / TILE_SIZE))
+    last_tile_x = min((image.shape[1] - 1) // TILE_SIZE, math.floor((origin_x + self._canvas.width / pixel_size) / TILE_SIZE))
+    last_tile_y = min((image.shape[0] - 1) // TILE_SIZE, math.floor((origin_y + self._canvas.height / pixel_size) / TILE_SIZE))
+
+    for tile_y in range(first_tile_y, last_tile_y + 1):
+      for tile_x in range(first_tile_x, last_tile_x + 1):
+        tile = self._tile(level, tile_x, tile_y)
+        self._canvas.draw_image(tile,
+          (tile_x * TILE_SIZE - origin_x) * pixel_size,
+          (tile_y * TILE_SIZE - origin_y) * pixel_size,
+          tile.width * pixel_size,
+          tile.height * pixel_size)
+
+  def _tile(self, level: int, tile_x: int, tile_y: int) -> Canvas:
+    """Finds a rendered tile, rendering it and evicting the least recently used tile on a miss."""
+    key = (level, tile_x, tile_y)
+    tile = self._tiles.get(key)
+    if tile is not None:
+      self._tiles.move_to_end(key)
+      return tile
+
+    walls = self._pyramid[level][tile_y * TILE_SIZE:(tile_y + 1) * TILE_SIZE, tile_x * TILE_SIZE:(tile_x + 1) * TILE_SIZE]
+    gray = WALL - walls # Walls are dark on a white background.
+    tile = Canvas(width=walls.shape[1], height=walls.shape[0])
+    tile.put_image_data(np.dstack((gray, gray, gray)), 0, 0)
+
+    self._tiles[key] = tile
+    if len(self._tiles) > self._max_tiles:
+      _evicted_key, evicted = self._tiles.popitem(last=False)
+      self._evicted.append(evicted)
+    return tile
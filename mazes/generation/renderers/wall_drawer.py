@@ -1,9 +1,9 @@
 # TODO: Restructure as a class or functions designed to be passed in.
 from ipycanvas import Canvas, hold_canvas
 
-from generation.maze import Maze, MazeCell
-from generation.structures import Corner, Point
-from generation.renderers.units import ROOM_SIZE_WIDTH, ROOM_SIZE_HEIGHT
+from ..maze import Maze, MazeCell
+from ..structures import Corner, Point
+from .units import ROOM_SIZE_WIDTH, ROOM_SIZE_HEIGHT
 
 def draw_wall(canvas: Canvas, start: Corner, stop: Corner) -> None:
   canvas.move_to(start.x, start.y)
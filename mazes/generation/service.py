@@ -0,0 +1,331 @@
+"""
+A local maze service so several processes can share generated mazes,
+solutions and renders instead of each computing their own.
+
+The server speaks a small framed protocol over a Unix socket or TCP on localhost.
+Every frame is a 4 byte big endian length followed by the body.
+
+Request body: UTF-8 JSON
+  {"op": "generate" | "solve" | "render", "seed": 42, "width": 40, "height": 40, "generator": "random_backtracer"}
+
+Response body: 1 status byte followed by the payload.
+  STATUS_OK    generate: encoding.encode_maze bytes
+               solve:    encoding.encode_path bytes
+               render:   the text render as UTF-8
+  STATUS_ERROR A UTF-8 error message.
+
+Concurrent requests for the same artifact are coalesced into a single computation.
+Requests for small mazes are batched into a single worker pool job.
+Mazes are limited to MAX_CELLS cells, about 12 seconds of work for a render.
+
+Example
+mazes serve --socket /tmp/mazes.sock
+client = MazeClient(socket_path='/tmp/mazes.sock')
+maze = decode_maze(client.request('generate', seed=42, width=40, height=40))
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor
+import json
+import socket
+import struct
+from typing import Dict, List, Optional, Tuple
+
+from .cache import ARTIFACT_DEPENDENCIES, MazeCache, MazeKey, SOLUTION_ARTIFACT, TEXT_RENDER_ARTIFACT, WALLS_ARTIFACT
+
+# Maps a request's op to the cached artifact it returns.
+OPERATIONS: Dict[str, str] = {
+  'generate': WALLS_ARTIFACT,
+  'solve': SOLUTION_ARTIFACT,
+  'render': TEXT_RENDER_ARTIFACT
+}
+
+STATUS_OK: int = 0
+STATUS_ERROR: int = 1
+
+MAX_DIMENSION: int = 4096
+# The generator and solver are pure Python, so a 500x500 maze already takes
+# seconds to generate and solve. Larger requests are rejected.
+MAX_CELLS: int = 250_000
+MAX_FRAME_BYTES: int = 64 * 1024
+
+_FRAME_HEADER = struct.Struct('>I')
+
+# A unit of work: the maze, the name of the artifact to build for it and the
+# already built artifacts it depends on, by name.
+Job = Tuple[MazeKey, str, Dict[str, bytes]]
+
+class MazeServiceError(Exception):
+  """Raised by the client when the service reports an error."""
+
+def compute_batch(jobs: List[Job]) -> List[Tuple[bool, bytes]]:
+  """
+  Builds a batch of artifacts. Runs in a worker process.
+
+  Returns
+  A (success, payload) tuple for each job, in order. The payload of a failed
+  job is the UTF-8 error message.
+  """
+  results: List[Tuple[bool, bytes]] = []
+  for key, name, inputs in jobs:
+    try:
+      # Seed a throwaway cache with the dependencies so the builder doesn't recompute them.
+      cache = MazeCache()
+      for input_name, value in inputs.items():
+        cache.store(key, input_name, value)
+      results.append((True, cache.artifact(key, name)))
+    except Exception as error:
+      results.append((False, str(error).encode('utf-8')))
+  return results
+
+class MazeService:
+  """Serves maze artifacts from a shared cache, computing misses in a worker pool."""
+  def __init__(self,
+    cache: Optional[MazeCache] = None,
+    executor: Optional[Executor] = None,
+    executor_factory: Optional[Callable[[], Executor]] = None,
+    batch_size: int = 32,
+    batch_delay: float = 0.002,
+    batch_max_cells: int = 10_000
+  ) -> None:
+    """
+    Args:
+      cache: Where results are shared. Defaults to an in memory cache.
+      executor: Runs the computations. Defaults to one made by executor_factory.
+      executor_factory: Makes a new executor to replace one that breaks, for example
+      when a worker process is killed. Defaults to ProcessPoolExecutor when no
+      executor is given. Without one, a broken executor fails every later request.
+      batch_size: The most jobs to send to a worker at once.
+      batch_delay: How long in seconds to wait for more small jobs before sending a batch.
+      batch_max_cells: Mazes with more cells than this are sent to a worker on their own.
+    """
+    self._cache = cache if cache is not None else MazeCache()
+    if executor_factory is None and executor is None:
+      executor_factory = ProcessPoolExecutor
+    self._executor_factory = executor_factory
+    self._executor = executor if executor is not None else executor_factory()
+    self._batch_size = batch_size
+    self._batch_delay = batch_delay
+    self._batch_max_cells = batch_max_cells
+    self._in_flight: Dict[Tuple[MazeKey, str], asyncio.Future] = {}
+    self._pending: List[Job] = []
+    self._flush_handle: Optional[asyncio.TimerHandle] = None
+    self.batches_submitted = 0
+
+  @property
+  def cache(self) -> MazeCache:
+    return self._cache
+
+  def close(self) -> None:
+    self._executor.shutdown(wait=False)
+
+  async def get(self, key: MazeKey, name: str) -> bytes:
+    """
+    Finds an artifact. Concurrent calls for the same artifact share one computation.
+    The artifacts it depends on are found first, so they are shared and cached too.
+
+    Throws
+    Raises a MazeServiceError if the artifact can't be built.
+    """
+    value = self._cache.lookup(key, name)
+    if value is not None:
+      return value
+
+    future = self._in_flight.get((key, name))
+    if future is None:
+      future = asyncio.get_running_loop().create_future()
+      self._in_flight[(key, name)] = future
+      try:
+        inputs = { dependency: await self.get(key, dependency) for dependency in ARTIFACT_DEPENDENCIES.get(name, []) }
+      except BaseException as error:
+        self._in_flight.pop((key, name))
+        future.set_exception(error if isinstance(error, MazeServiceError) else MazeServiceError(str(error)))
+        future.exception() # Mark it retrieved in case nobody else is waiting.
+        raise
+      self._schedule((key, name, inputs))
+    # Shield the shared future so one caller being cancelled doesn't cancel it for everyone.
+    return await asyncio.shield(future)
+
+  def _schedule(self, job: Job) -> None:
+    key = job[0]
+    if key.width * key.height > self._batch_max_cells:
+      self._submit([job])
+      return
+
+    self._pending.append(job)
+    if len(self._pending) >= self._batch_size:
+      self._flush()
+    elif self._flush_handle is None:
+      self._flush_handle = asyncio.get_running_loop().call_later(self._batch_delay, self._flush)
+
+  def _flush(self) -> None:
+    """Sends the pending small jobs to a worker as one batch."""
+    if self._flush_handle is not None:
+      self._flush_handle.cancel()
+      self._flush_handle = None
+    jobs, self._pending = self._pending, []
+    if len(jobs) > 0:
+      self._submit(jobs)
+
+  def _replace_executor(self, broken: Executor) -> bool:
+    """
+    Swaps a broken executor for a new one. Does nothing if it was already replaced.
+
+    Returns
+    False if there is no executor_factory to make a replacement.
+    """
+    if broken is not self._executor:
+      return True
+    if self._executor_factory is None:
+      return False
+    broken.shutdown(wait=False)
+    self._executor = self._executor_factory()
+    return True
+
+  def _submit(self, jobs: List[Job]) -> None:
+    """Sends jobs to the executor. If that fails, everyone waiting on the jobs gets the error."""
+    self.batches_submitted += 1
+    executor = self._executor
+    try:
+      task = asyncio.get_running_loop().run_in_executor(executor, compute_batch, jobs)
+    except BrokenExecutor as error:
+      # The pool broke since the last batch finished. Try once more on a new one.
+      if not self._replace_executor(executor):
+        self._fail(jobs, f'The worker pool is broken: {error}')
+        return
+      executor = self._executor
+      try:
+        task = asyncio.get_running_loop().run_in_executor(executor, compute_batch, jobs)
+      except Exception as retry_error:
+        self._fail(jobs, f'Could not start the work: {retry_error}')
+        return
+    except Exception as error:
+      self._fail(jobs, f'Could not start the work: {error}')
+      return
+    task.add_done_callback(lambda done: self._complete(jobs, done, executor))
+
+  def _fail(self, jobs: List[Job], message: str) -> None:
+    """Fails everyone waiting on the jobs."""
+    for key, name, _inputs in jobs:
+      future = self._in_flight.pop((key, name), None)
+      if future is not None and not future.done():
+        future.set_exception(MazeServiceError(message))
+
+  def _complete(self, jobs: List[Job], done: asyncio.Future, executor: Executor) -> None:
+    """Shares a finished batch's results with everyone waiting on them."""
+    if done.cancelled():
+      self._fail(jobs, 'The work was cancelled.')
+      return
+    error = done.exception()
+    if error is not None:
+      # A worker died while running the batch. Don't retry it, it may be what killed the worker.
+      if isinstance(error, BrokenExecutor):
+        self._replace_executor(executor)
+      self._fail(jobs, f'The work failed: {error}')
+      return
+
+    for (key, name, _inputs), (success, payload) in zip(jobs, done.result()):
+      future = self._in_flight.pop((key, name), None)
+      if future is None or future.done():
+        continue
+      if success:
+        self._cache.store(key, name, payload)
+        future.set_result(payload)
+      else:
+        future.set_exception(MazeServiceError(payload.decode('utf-8')))
+
+  async def handle_request(self, body: bytes) -> bytes:
+    """
+    Answers a single request frame's body.
+
+    Returns
+    The response frame's body.
+    """
+    try:
+      request = json.loads(body)
+      op = request['op']
+      if op not in OPERATIONS:
+        raise ValueError(f'Unknown op {op}. Expected one of {list(OPERATIONS.keys())}.')
+      width, height, seed = request['width'], request['height'], request['seed']
+      if not all(isinstance(value, int) and not isinstance(value, bool) for value in (width, height, seed)):
+        raise ValueError('The width, height and seed must be integers.')
+      if not (0 < width <= MAX_DIMENSION and 0 < height <= MAX_DIMENSION):
+        raise ValueError(f'The width and height must be between 1 and {MAX_DIMENSION}.')
+      if width * height > MAX_CELLS:
+        raise ValueError(f'The maze can have at most {MAX_CELLS} cells.')
+      key = self._cache.key(request.get('generator', 'random_backtracer'), seed, width, height)
+      payload = await self.get(key, OPERATIONS[op])
+      return bytes([STATUS_OK]) + payload
+    except (KeyError, ValueError, TypeError, OverflowError, MazeServiceError) as error:
+      return bytes([STATUS_ERROR]) + str(error).encode('utf-8')
+
+  async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Answers requests from a client until it disconnects."""
+    try:
+      while True:
+        (length,) = _FRAME_HEADER.unpack(await reader.readexactly(_FRAME_HEADER.size))
+        if length > MAX_FRAME_BYTES:
+          break
+        response = await self.handle_request(await reader.readexactly(length))
+        writer.write(_FRAME_HEADER.pack(len(response)) + response)
+        await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+      pass # The client disconnected, possibly in the middle of a frame.
+    finally:
+      writer.close()
+
+  async def serve(self, socket_path: Optional[str] = None, host: str = '127.0.0.1', port: int = 8765) -> None:
+    """Listens on a Unix socket if a path is given, otherwise on TCP. Runs until cancelled."""
+    if socket_path is not None:
+      server = await asyncio.start_unix_server(self.handle_connection, path=socket_path)
+    else:
+      server = await asyncio.start_server(self.handle_connection, host=host, port=port)
+    async with server:
+      await server.serve_forever()
+
+class MazeClient:
+  """A blocking client for the maze service."""
+  def __init__(self, socket_path: Optional[str] = None, host: str = '127.0.0.1', port: int = 8765) -> None:
+    if socket_path is not None:
+      self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+      self._socket.connect(socket_path)
+    else:
+      self._socket = socket.create_connection((host, port))
+
+  def close(self) -> None:
+    self._socket.close()
+
+  def __enter__(self) -> MazeClient:
+    return self
+
+  def __exit__(self, *_exc_info) -> None:
+    self.close()
+
+  def _read_exactly(self, size: int) -> bytes:
+    data = bytearray()
+    while len(data) < size:
+      chunk = self._socket.recv(size - len(data))
+      if not chunk:
+        raise MazeServiceError('The service closed the connection.')
+      data.extend(chunk)
+    return bytes(data)
+
+  def request(self, op: str, seed: int, width: int, height: int, generator: str = 'random_backtracer') -> bytes:
+    """
+    Sends a request and waits for the response.
+
+    Returns
+    The response payload. See the module docstring for its format.
+
+    Throws
+    Raises a MazeServiceError if the service reports an error.
+    """
+    body = json.dumps({'op': op, 'seed': seed, 'width': width, 'height': height, 'generator': generator}).encode('utf-8')
+    self._socket.sendall(_FRAME_HEADER.pack(len(body)) + body)
+    (length,) = _FRAME_HEADER.unpack(self._read_exactly(_FRAME_HEADER.size))
+    response = self._read_exactly(length)
+    if response[0] != STATUS_OK:
+      raise MazeServiceError(response[1:].decode('utf-8'))
+    return response[1:]
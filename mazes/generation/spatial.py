@@ -0,0 +1,160 @@
+"""
+A spatial hash of where agents are in a maze.
+
+Agents added to an OccupancyGrid keep it up to date as they move, so
+questions like "who is in this room" or "who is within k steps" don't
+require scanning every agent.
+
+Example
+grid = OccupancyGrid()
+for agent in agents:
+  grid.add(agent)
+grid.at(Point(3, 4))
+grid.within_steps(maze, Point(3, 4), 5)
+"""
+from __future__ import annotations
+
+from collections import deque
+from typing import Callable, Dict, Iterable, Iterator, List, Set, Tuple, TYPE_CHECKING
+
+from .maze import Maze
+from .structures import Point
+
+if TYPE_CHECKING:
+  from .npc import Agent
+
+class OccupancyGrid:
+  """Maps maze locations to the agents in them."""
+  def __init__(self) -> None:
+    self._cells: Dict[Point, Set[Agent]] = {}
+    self._crowded: Set[Point] = set() # Locations with more than one agent.
+    self._count = 0
+
+  def __len__(self) -> int:
+    """The number of agents being tracked."""
+    return self._count
+
+  def __contains__(self, agent: Agent) -> bool:
+    return agent in self._cells.get(agent.location, ())
+
+  def add(self, agent: Agent) -> None:
+    """Starts tracking an agent at its current location."""
+    if agent.occupancy is not None:
+      agent.occupancy.remove(agent)
+    self._insert(agent, agent.location)
+    self._count += 1
+    agent.occupancy = self
+
+  def remove(self, agent: Agent) -> None:
+    """Stops tracking an agent. Does nothing if the agent isn't tracked."""
+    if agent.occupancy is not self:
+      return
+    self._discard(agent, agent.location)
+    self._count -= 1
+    agent.occupancy = None
+
+  def move(self, agent: Agent, old_location: Point, new_location: Point) -> None:
+    """Called by Agent.move_to to keep the grid in sync."""
+    self._discard(agent, old_location)
+    self._insert(agent, new_location)
+
+  def _insert(self, agent: Agent, location: Point) -> None:
+    occupants = self._cells.get(location)
+    if occupants is None:
+      occupants = self._cells[location] = set()
+    occupants.add(agent)
+    if len(occupants) > 1:
+      self._crowded.add(location)
+
+  def _discard(self, agent: Agent, location: Point) -> None:
+    occupants = self._cells.get(location)
+    if occupants is None:
+      return
+    occupants.discard(agent)
+    if len(occupants) < 2:
+      self._crowded.discard(location)
+    if len(occupants) == 0:
+      del self._cells[location]
+
+  def at(self, location: Point) -> Set[Agent]:
+    """Finds the agents in a room. The returned set must not be modified."""
+    return self._cells.get(location, set())
+
+  def count(self, location: Point) -> int:
+    return len(self._cells.get(location, ()))
+
+  def occupied(self, location: Point) -> bool:
+    return location in self._cells
+
+  def at_many(self, locations: Iterable[Point]) -> Dict[Point, Set[Agent]]:
+    """Finds the agents in each of the given rooms. Empty rooms are left out."""
+    return { location: self._cells[location] for location in locations if location in self._cells }
+
+  def occupied_locations(self) -> Iterator[Point]:
+    return iter(self._cells.keys())
+
+  def collisions(self) -> Dict[Point, Set[Agent]]:
+    """Finds every room that has more than one agent in it."""
+    return { location: self._cells[location] for location in self._crowded }
+
+  def in_rect(self, upper_left: Point, lower_right: Point) -> List[Agent]:
+    """Finds the agents in the rectangle of rooms between two corners, inclusive."""
+    locations = ((x, y) for y in range(upper_left.y, lower_right.y + 1) for x in range(upper_left.x, lower_right.x + 1))
+    area = (lower_right.x - upper_left.x + 1) * (lower_right.y - upper_left.y + 1)
+    return self._gather(locations, area, lambda p: upper_left.x <= p.x <= lower_right.x and upper_left.y <= p.y <= lower_right.y)
+
+  def within_radius(self, center: Point, radius: int) -> List[Agent]:
+    """Finds the agents whose rooms are within a Manhattan distance of the center, ignoring walls."""
+    locations = (
+      (x, y)
+      for y in range(center.y - radius, center.y + radius + 1)
+      for x in range(center.x - radius + abs(y - center.y), center.x + radius - abs(y - center.y) + 1)
+    )
+    area = 2 * radius * (radius + 1) + 1
+    return self._gather(locations, area, lambda p: abs(p.x - center.x) + abs(p.y - center.y) <= radius)
+
+  def _gather(self, locations: Iterable[Tuple[int, int]], area: int, contains: Callable[[Point], bool]) -> List[Agent]:
+    """
+    Collects the agents in a region. Either walks the region's rooms or the
+    occupied rooms, whichever is fewer.
+    """
+    found: List[Agent] = []
+    if area <= len(self._cells):
+      for x, y in locations:
+        occupants = self._cells.get(Point(x, y))
+        if occupants is not None:
+          found.extend(occupants)
+    else:
+      for location, occupants in self._cells.items():
+        if contains(location):
+          found.extend(occupants)
+    return found
+
+  def within_steps(self, maze: Maze, start: Point, steps: int) -> Dict[Point, Set[Agent]]:
+    """
+    Finds the agents that can be reached from a room by walking through at most
+    the given number of open doors.
+
+    Returns
+    The occupied reachable rooms and who is in them.
+
+    Throws
+    Raises a ValueError if the start is outside of the maze.
+    """
+    if maze.out_of_bounds(start):
+      raise ValueError(f'The start ({start.x},{start.y}) is outside of the maze.')
+    found: Dict[Point, Set[Agent]] = {}
+    visited: Set[Point] = { start }
+    frontier = deque([(start, 0)])
+    while len(frontier) > 0:
+      location, distance = frontier.popleft()
+      if location in self._cells:
+        found[location] = self._cells[location]
+      if distance == steps:
+        continue
+      for direction in maze.cell(location).open_sides():
+        neighbor = maze.find_adjacent_neighbor(direction, location)
+        if neighbor not in visited and not maze.out_of_bounds(neighbor):
+          visited.add(neighbor)
+          frontier.append((neighbor, distance + 1))
+    return found
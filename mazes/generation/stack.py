@@ -1,6 +1,6 @@
 from collections import deque
 from typing import Optional
-from generation.maze import MazeCell
+from .maze import MazeCell
 
 class Stack:
   """
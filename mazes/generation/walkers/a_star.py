@@ -4,10 +4,14 @@ from heapq import heappop, heappush
 from typing import Dict, List, Set, Tuple, Union
 import itertools
 
-from generation.structures import Point
-from generation.maze import Maze, MazeCell
-from generation.npc import Agent
-from generation.direction import Direction
+from ..structures import Point
+from ..maze import Maze, MazeCell
+from ..npc import Agent
+from ..direction import Direction
+
+# Bump when a change to the solver would find a different path for the same maze.
+# Cached solutions are keyed by this so they are invalidated.
+SOLVER_VERSION: int = 1
 
 class Waypoint:
   """A decorator class that wraps a Point to enable chaining points."""
@@ -244,4 +248,18 @@ def build_path_walker(path_to_walk: Path):
       current_step_index += 1
       agent.move_to(path[current_step_index])
 
-  return walk_path
\ No newline at end of file
+  return walk_path
+
+def solve_maze(maze: Maze) -> Path:
+  """
+  Finds a path from the maze's entrance to its exit.
+
+  Throws
+  Raises an Exception if the exit can't be reached.
+  """
+  agent = Agent()
+  agent.move_to(maze.starting_cell.location)
+  found, path = find_path(agent, maze, maze.exit_cell.location)
+  if not found:
+    raise Exception('No path exists between the entrance and the exit.')
+  return path
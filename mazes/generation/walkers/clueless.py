@@ -1,9 +1,9 @@
 from typing import List
 
-from generation.direction import Direction, DIR_ORIENTATION, Orientation
-from generation.maze import Maze
-from generation.npc import Agent
-from generation.structures import Point
+from ..direction import Direction, DIR_ORIENTATION, Orientation
+from ..maze import Maze
+from ..npc import Agent
+from ..structures import Point
 
 def find_next_direction(agent: Agent, possible_directions: list[Direction]) -> Direction:
   """The agent is facing a direction. I think it should continue in the same direction
@@ -0,0 +1,190 @@
+"""
+Answers where a wall follower will be after any number of steps without walking it.
+
+A wall follower's next move only depends on the room it's in and the
+direction it's facing, which is the door it just walked through. So every
+door, taken in one direction, has exactly one door that is walked through
+next. Following those links from door to door forms cycles. In a perfect
+maze there is a single cycle that walks every door once in each direction,
+the Euler tour of the maze's spanning tree.
+
+WallFollowerTour lays those cycles out in arrays once. Afterwards, finding
+the follower's position after k steps or how many steps until it stops at
+the entrance or exit is a constant time lookup.
+
+Example
+tour = WallFollowerTour(maze)
+tour.position_after(agent.location, agent.facing, 1000)
+tour.steps_until_stop(agent.location, agent.facing)
+"""
+from array import array
+from typing import List, Optional, Tuple
+
+from ..direction import Direction, DIR_ORIENTATION, Orientation
+from ..encoding import WALL_BITS, encode_walls
+from ..maze import Maze
+from ..structures import Point
+
+# Doors are numbered cell_index * 4 + the direction's index here.
+DIRECTIONS: List[Direction] = [Direction.NORTH, Direction.EAST, Direction.SOUTH, Direction.WEST]
+_DIRECTION_INDEX = { direction: index for index, direction in enumerate(DIRECTIONS) }
+
+# The order a follower tries doors in, relative to the way it's facing.
+_PREFERENCES = {
+  Orientation.RIGHT: lambda facing: [DIR_ORIENTATION[facing][Orientation.RIGHT], facing, DIR_ORIENTATION[facing][Orientation.LEFT], DIR_ORIENTATION[facing][Orientation.BEHIND]],
+  Orientation.LEFT: lambda facing: [DIR_ORIENTATION[facing][Orientation.LEFT], facing, DIR_ORIENTATION[facing][Orientation.RIGHT], DIR_ORIENTATION[facing][Orientation.BEHIND]]
+}
+
+_NO_DOOR = -1
+_NEVER = -1
+
+class WallFollowerTour:
+  """
+  The precomputed walks of a wall follower through a maze.
+
+  The follower behaves like walkers.wall_follower.wall_follower_walk: it stops
+  once it is in the maze's starting or exit cell and never walks out of the maze.
+  """
+  def __init__(self, maze: Maze, hand: Orientation = Orientation.RIGHT) -> None:
+    """
+    Args:
+      maze: The maze to walk. Later changes to its walls are not tracked.
+      hand: Orientation.RIGHT for a right hand follower, Orientation.LEFT for a left hand one.
+    """
+    if hand not in _PREFERENCES:
+      raise ValueError('A wall follower keeps either its right or left hand on the wall.')
+    self._maze = maze
+    self._hand = hand
+    self._width = maze.width
+    self._height = maze.height
+    self._stop_cells = set(
+      cell.location.y * maze.width + cell.location.x
+      for cell in (getattr(maze, 'starting_cell', None), getattr(maze, 'exit_cell', None))
+      if cell is not None
+    )
+    self._build()
+
+  @property
+  def hand(self) -> Orientation:
+    return self._hand
+
+  @property
+  def cycle_count(self) -> int:
+    """The number of separate walks. A perfect maze has one."""
+    return len(self._cycle_starts) - 1
+
+  def _neighbor(self, cell: int, direction_index: int) -> int:
+    """Finds the cell through a door, or _NO_DOOR if it leads out of the maze."""
+    x, y = cell % self._width, cell // self._width
+    if direction_index == 0: y -= 1
+    elif direction_index == 1: x += 1
+    elif direction_index == 2: y += 1
+    else: x -= 1
+    if x < 0 or x >= self._width or y < 0 or y >= self._height:
+      return _NO_DOOR
+    return y * self._width + x
+
+  def _choose(self, cell: int, facing: Direction) -> int:
+    """Picks the door the follower walks through next. Returns _NO_DOOR if it's walled in."""
+    for direction in _PREFERENCES[self._hand](facing):
+      door = cell * 4 + _DIRECTION_INDEX[direction]
+      if self._heads[door] != _NO_DOOR:
+        return door
+    return _NO_DOOR
+
+  def _build(self) -> None:
+    cell_count = self._width * self._height
+    walls = encode_walls(self._maze)
+
+    # The cell each door leads to, ignoring closed doors and the openings out of the maze.
+    self._heads = array('l', [_NO_DOOR]) * (cell_count * 4)
+    for cell in range(cell_count):
+      for direction_index, direction in enumerate(DIRECTIONS):
+        if not walls[cell] & WALL_BITS[direction]:
+          self._heads[cell * 4 + direction_index] = self._neighbor(cell, direction_index)
+
+    # Lay every cycle of doors out end to end, recording where each cycle starts.
+    self._tour = array('l')
+    self._position = array('l', [_NO_DOOR]) * (cell_count * 4)
+    self._cycle_of = array('l', [_NO_DOOR]) * (cell_count * 4)
+    self._cycle_starts = array('l', [0])
+    for first_door in range(cell_count * 4):
+      if self._heads[first_door] == _NO_DOOR or self._position[first_door] != _NO_DOOR:
+        continue
+      cycle = len(self._cycle_starts) - 1
+      door = first_door
+      while self._position[door] == _NO_DOOR:
+        self._position[door] = len(self._tour)
+        self._cycle_of[door] = cycle
+        self._tour.append(door)
+        door = self._choose(self._heads[door], DIRECTIONS[door % 4])
+      self._cycle_starts.append(len(self._tour))
+
+    # For each door, how many doors later in its cycle the follower first enters a stop cell.
+    self._to_stop = array('l', [_NEVER]) * len(self._tour)
+    for cycle in range(self.cycle_count):
+      start, end = self._cycle_starts[cycle], self._cycle_starts[cycle + 1]
+      length = end - start
+      next_stop = _NEVER
+      # Sweep backwards around the cycle twice so the doors at the end see the stops at the start.
+      for offset in range(2 * length - 1, -1, -1):
+        door = self._tour[start + offset % length]
+        if self._heads[door] in self._stop_cells:
+          next_stop = offset
+        if offset < length and next_stop != _NEVER:
+          self._to_stop[start + offset] = next_stop - offset
+
+  def _first_door(self, location: Point, facing: Direction) -> int:
+    """
+    Finds the first door a follower walks through, or _NO_DOOR if it doesn't move.
+
+    Throws
+    Raises an Exception if the follower is walled in, as wall_follower_walk does.
+    """
+    cell = location.y * self._width + location.x
+    if cell in self._stop_cells:
+      return _NO_DOOR
+    door = self._choose(cell, facing)
+    if door == _NO_DOOR:
+      raise Exception("We\'re walled in! No possible doors found.")
+    return door
+
+  def steps_until_stop(self, location: Point, facing: Direction) -> Optional[int]:
+    """
+    Finds how many steps a follower takes before it reaches the maze's starting
+    or exit cell and stops.
+
+    Returns
+    The number of steps, 0 if it starts in one of them, or None if it never reaches either.
+    """
+    door = self._first_door(location, facing)
+    if door == _NO_DOOR:
+      return 0
+    to_stop = self._to_stop[self._position[door]]
+    return to_stop + 1 if to_stop != _NEVER else None
+
+  def position_after(self, location: Point, facing: Direction, steps: int) -> Tuple[Point, Direction]:
+    """
+    Finds where a follower is, and the way it's facing, after walking a number of steps.
+    A follower that reaches the starting or exit cell stays there.
+
+    Returns
+    A tuple of the form (location, facing).
+    """
+    if steps <= 0:
+      return (location, facing)
+    door = self._first_door(location, facing)
+    if door == _NO_DOOR:
+      return (location, facing)
+
+    position = self._position[door]
+    to_stop = self._to_stop[position]
+    if to_stop != _NEVER:
+      steps = min(steps, to_stop + 1)
+
+    cycle = self._cycle_of[door]
+    start = self._cycle_starts[cycle]
+    length = self._cycle_starts[cycle + 1] - start
+    last_door = self._tour[start + (position - start + steps - 1) % length]
+    head = self._heads[last_door]
+    return (Point(head % self._width, head // self._width), DIRECTIONS[last_door % 4])
@@ -1,9 +1,9 @@
 from typing import List
 
-from generation.direction import Direction, DIR_ORIENTATION, Orientation
-from generation.maze import Maze
-from generation.npc import Agent
-from generation.structures import Point
+from ..direction import Direction, DIR_ORIENTATION, Orientation
+from ..maze import Maze
+from ..npc import Agent
+from ..structures import Point
 
 def wall_follower_walk(agent: Agent, maze: Maze) -> None:
   """